@@ -1,7 +1,7 @@
 import asyncio
 
-from typing import Optional
-from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Optional
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -9,6 +9,14 @@ class RequestPayload:
     messages: str
     session_id: str | None = None
     params: dict = field(default_factory=dict)
+    index: int | None = None
+    # Decodes `messages` and `params` on first use, for payloads read lazily from a dataset cache.
+    loader: Callable[[], tuple[Any, dict]] | None = None
+
+    def load(self) -> None:
+        if self.loader is not None:
+            self.messages, self.params = self.loader()
+            self.loader = None
 
 
 class AsyncIDItem:
@@ -29,7 +37,12 @@ class AsyncIDItem:
             raise RuntimeError(
                 f"SessionIDItem with session_id={self.session_id} is not active. Access only inside 'async with' block."
             )
-        return asdict(self.request_payload)
+        self.request_payload.load()
+        return {
+            "messages": self.request_payload.messages,
+            "session_id": self.request_payload.session_id,
+            "params": self.request_payload.params,
+        }
 
     async def __aexit__(self, exc_type, exc_value, traceback):
         if self.active:
@@ -43,25 +56,43 @@ class AsyncSessionIDQueue:
         self.current_session_ids = set()
         self.session_id_key = session_id_key
         self._lock = asyncio.Lock()
+        # Notified whenever a session is released, so that workers waiting for a busy session can retry.
+        self._released = asyncio.Condition(self._lock)
+
+    def is_empty(self) -> bool:
+        return not self.request_payloads
+
+    async def get_item(self, stop: Callable[[], bool] | None = None) -> AsyncIDItem:
+        """
+        Takes the first payload whose session is not busy, waiting for a session to be released if needed.
 
-    async def get_item(self) -> AsyncIDItem:
-        async with self._lock:
-            index = None
-            session_id = None
-            return_request_payload = None
+        Returns an empty item once all payloads have been taken, or if `stop` returns True while waiting.
+        """
+        async with self._released:
+            while self.request_payloads:
+                for i, request_payload in enumerate(self.request_payloads):
+                    # Payloads without a session are independent and never wait for each other.
+                    if request_payload.session_id is None or request_payload.session_id not in self.current_session_ids:
+                        return_request_payload = self.request_payloads.pop(i)
+                        session_id = return_request_payload.session_id
+                        if session_id is not None:
+                            self.current_session_ids.add(session_id)
+                        return AsyncIDItem(self, return_request_payload, session_id)
 
-            for i, request_payload in enumerate(self.request_payloads):
-                if request_payload.session_id not in self.current_session_ids:
-                    index = i
+                if stop is not None and stop():
                     break
+                await self._released.wait()
 
-            if index is not None:
-                return_request_payload = self.request_payloads.pop(index)
-                session_id = return_request_payload.session_id
-                self.current_session_ids.add(session_id)
+            return AsyncIDItem(self, None, None)
 
-            return AsyncIDItem(self, return_request_payload, session_id)
+    async def wake_up(self) -> None:
+        """Wakes all workers waiting for a busy session, e.g. to let them re-check `stop`."""
+        async with self._released:
+            self._released.notify_all()
 
-    async def _session_end(self, session_id: str):
-        async with self._lock:
+    async def _session_end(self, session_id: str | None):
+        if session_id is None:
+            return
+        async with self._released:
             self.current_session_ids.remove(session_id)
+            self._released.notify_all()
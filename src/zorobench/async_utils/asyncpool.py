@@ -1,32 +1,95 @@
 import asyncio
 
-from typing import Callable, Any
-from .async_session_queue import AsyncSessionIDQueue
+from typing import Awaitable, Callable, Any
+from .async_session_queue import AsyncSessionIDQueue, RequestPayload
 
 
 class AsyncPool:
     def __init__(self, concurrency: int):
         self.concurrency = concurrency
+        self._spawn_worker: Callable[[], None] | None = None
+        self._wake_workers: Callable[[], None] | None = None
+        self._num_workers = 0
+        self._exhausted = False
 
-    async def run(self, func: Callable[..., Any], async_session_queue: AsyncSessionIDQueue) -> list[Any]:
+    def set_concurrency(self, concurrency: int) -> None:
+        """Change the number of workers, also while the pool is running.
+
+        New workers are started immediately, surplus workers stop after finishing their current request
+        or, if they are waiting for a busy session, right away.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
+        self.concurrency = concurrency
+
+        if self._spawn_worker is None:
+            return
+        if self._num_workers > self.concurrency:
+            self._wake_workers()
+        elif not self._exhausted:
+            for _ in range(self.concurrency - self._num_workers):
+                self._spawn_worker()
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        async_session_queue: AsyncSessionIDQueue,
+        on_result: Callable[[RequestPayload, Any], Awaitable[None]] | None = None,
+    ) -> list[Any]:
         results_queue: asyncio.Queue = asyncio.Queue()
+        tasks: set[asyncio.Task] = set()
+
+        def is_surplus() -> bool:
+            return self._num_workers > self.concurrency
 
         async def worker():
-            while True:
-                async with await async_session_queue.get_item() as ctx:
-                    if ctx is None:
-                        break
-                    kwargs = ctx.get_kwargs()
+            try:
+                while not is_surplus():
+                    async with await async_session_queue.get_item(stop=is_surplus) as ctx:
+                        if ctx is None:
+                            # Either all payloads were taken or the worker became surplus while waiting.
+                            if async_session_queue.is_empty():
+                                self._exhausted = True
+                            break
+                        kwargs = ctx.get_kwargs()
+
+                        if asyncio.iscoroutinefunction(func):
+                            result = await func(**kwargs)
+                        else:
+                            result = func(**kwargs)
+                        await results_queue.put(result)
+
+                        # Called before the session is released, so the next turn of the
+                        # same session cannot start until the callback has finished.
+                        if on_result is not None:
+                            await on_result(ctx.request_payload, result)
+            finally:
+                self._num_workers -= 1
+
+        def spawn_worker():
+            self._num_workers += 1
+            task = asyncio.create_task(worker())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
 
-                    if asyncio.iscoroutinefunction(func):
-                        result = await func(**kwargs)
-                    else:
-                        result = func(**kwargs)
-                    await results_queue.put(result)
+        def wake_workers():
+            task = asyncio.create_task(async_session_queue.wake_up())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
 
-        tasks = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        self._spawn_worker = spawn_worker
+        self._wake_workers = wake_workers
+        self._num_workers = 0
+        self._exhausted = False
+        try:
+            for _ in range(self.concurrency):
+                spawn_worker()
 
-        await asyncio.gather(*tasks)
+            while tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            self._spawn_worker = None
+            self._wake_workers = None
 
         results = []
         while not results_queue.empty():
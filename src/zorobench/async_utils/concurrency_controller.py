@@ -0,0 +1,152 @@
+import logging
+import time
+
+from dataclasses import dataclass, asdict
+from .asyncpool import AsyncPool
+from ..requester.request_statistics import RequestStatistics
+
+
+@dataclass(frozen=True)
+class ControllerStep:
+    elapsed: float
+    concurrency: int
+    request_rate: float
+    ttft_p95: float
+    itl_p95: float
+    error_rate: float
+    meets_slo: bool
+    next_concurrency: int
+
+
+class AIMDConcurrencyController:
+    """
+    Adjusts the concurrency of a running AsyncPool to find the highest load that meets latency SLOs.
+
+    Completed requests are grouped into windows of `window_size`. After each window the p95 TTFT and
+    p95 ITL are compared with the SLOs: once `stable_windows` consecutive windows met them without a
+    failed request, the concurrency is increased by `increase_step` (additive increase); a window that
+    misses them multiplies it by `decrease_factor` (multiplicative decrease). Requests sent before the
+    last adjustment are not counted, so every window only contains requests sent at a single concurrency.
+
+    A concurrency is reported as sustainable if its last `stable_windows` windows all met the SLOs.
+    """
+
+    def __init__(
+        self,
+        pool: AsyncPool,
+        slo_ttft: float | None = None,
+        slo_itl: float | None = None,
+        window_size: int = 20,
+        increase_step: int = 1,
+        decrease_factor: float = 0.5,
+        min_concurrency: int = 1,
+        max_concurrency: int = 256,
+        stable_windows: int = 2,
+    ):
+        if slo_ttft is None and slo_itl is None:
+            raise ValueError("At least one of 'slo_ttft' or 'slo_itl' must be defined.")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("'decrease_factor' must be between 0 and 1.")
+
+        self.pool = pool
+        self.slo_ttft = slo_ttft
+        self.slo_itl = slo_itl
+        self.window_size = window_size
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.stable_windows = stable_windows
+
+        self.trace: list[ControllerStep] = []
+        self._window: list[RequestStatistics] = []
+        self._passing_windows = 0
+        self._start_time = time.perf_counter()
+        self._window_start_time = self._start_time
+        self._last_adjustment_time = self._start_time
+
+    def observe(self, statistics: RequestStatistics) -> None:
+        # Requests sent before the last adjustment ran at the previous concurrency.
+        sent_at = time.perf_counter() - statistics.e2e
+        if sent_at < self._last_adjustment_time:
+            return
+
+        self._window.append(statistics)
+        if len(self._window) >= self.window_size:
+            self._step()
+
+    def _meets_slo(self, ttft_p95: float, itl_p95: float) -> bool:
+        if self.slo_ttft is not None and not ttft_p95 <= self.slo_ttft:
+            return False
+        if self.slo_itl is not None and not itl_p95 <= self.slo_itl:
+            return False
+        return True
+
+    def _step(self) -> None:
+        now = time.perf_counter()
+        window, self._window = self._window, []
+
+        successful = RequestStatistics._successful_requests(window)
+        ttft_p95 = RequestStatistics._describe([s.ttft for s in successful if s.ttft is not None])["p95"]
+        itl_p95 = RequestStatistics._describe(RequestStatistics._create_itl(successful))["p95"]
+        error_rate = 1 - len(successful) / len(window)
+        duration = now - self._window_start_time
+        request_rate = len(window) / duration if duration > 0 else float("nan")
+
+        concurrency = self.pool.concurrency
+        meets_slo = error_rate == 0 and self._meets_slo(ttft_p95, itl_p95)
+        self._passing_windows = self._passing_windows + 1 if meets_slo else 0
+        if not meets_slo:
+            next_concurrency = max(self.min_concurrency, int(concurrency * self.decrease_factor))
+        elif self._passing_windows >= self.stable_windows:
+            # The current concurrency is confirmed, so every level passed on the way up is sustainable.
+            next_concurrency = min(self.max_concurrency, concurrency + self.increase_step)
+        else:
+            next_concurrency = concurrency
+
+        step = ControllerStep(
+            elapsed=now - self._start_time,
+            concurrency=concurrency,
+            request_rate=request_rate,
+            ttft_p95=ttft_p95,
+            itl_p95=itl_p95,
+            error_rate=error_rate,
+            meets_slo=meets_slo,
+            next_concurrency=next_concurrency,
+        )
+        self.trace.append(step)
+        logging.info(
+            f"Concurrency {concurrency} -> {next_concurrency}: p95 TTFT: {ttft_p95:.4f}s, "
+            f"p95 ITL: {itl_p95:.4f}s, errors: {error_rate:.2%}, rate: {request_rate:.2f} req/s"
+        )
+
+        self._window_start_time = now
+        if next_concurrency != concurrency:
+            self._passing_windows = 0
+            self._last_adjustment_time = now
+            self.pool.set_concurrency(next_concurrency)
+
+    def summary(self) -> dict:
+        """
+        Highest concurrency whose last `stable_windows` windows all met the SLOs and the mean request rate
+        of those windows, together with the full trace.
+        """
+        steps_by_concurrency: dict[int, list[ControllerStep]] = {}
+        for step in self.trace:
+            steps_by_concurrency.setdefault(step.concurrency, []).append(step)
+
+        sustainable = None
+        for concurrency, steps in sorted(steps_by_concurrency.items()):
+            last_steps = steps[-self.stable_windows :]
+            if len(last_steps) == self.stable_windows and all(step.meets_slo for step in last_steps):
+                sustainable = (concurrency, last_steps)
+
+        return {
+            "SLO": {"ttft_p95": self.slo_ttft, "itl_p95": self.slo_itl},
+            "Stable windows": self.stable_windows,
+            "Max concurrency": sustainable[0] if sustainable else None,
+            "Max request rate": (
+                sum(step.request_rate for step in sustainable[1]) / len(sustainable[1]) if sustainable else None
+            ),
+            "Trace": [asdict(step) for step in self.trace],
+        }
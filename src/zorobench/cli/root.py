@@ -1,12 +1,22 @@
 import asyncio
+import json
 import logging
 import time
 
 from ..requester.request_statistics import RequestStatistics
 from ..data_utils.data_loader import DataLoader
+from ..data_utils.checkpoint import Checkpoint
 from ..async_utils.asyncpool import AsyncPool
 from ..async_utils.async_session_queue import AsyncSessionIDQueue
+from ..async_utils.concurrency_controller import AIMDConcurrencyController
 from ..requester.openai_api_requester import OpenAIAPIRequester
+from ..requester.openai_completions_requester import OpenAICompletionsRequester
+from ..requester.openai_embeddings_requester import OpenAIEmbeddingsRequester
+
+REQUESTERS = {
+    "chat": OpenAIAPIRequester,
+    "completions": OpenAICompletionsRequester,
+}
 
 
 class Root:
@@ -14,14 +24,58 @@ class Root:
     TODO: Write
     """
 
+    @staticmethod
+    def _setup_logging(verbose: bool) -> None:
+        log_level = logging.INFO if verbose else logging.WARN
+        logging.basicConfig(
+            level=log_level,
+            format="[%(asctime)s] [%(levelname)s]: %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+
+    def prepare(self, filepath: str, kind: str = "chat", cache_dir: str = ".zorobench_cache", verbose: bool = False):
+        """
+        Validates all requests in a data file and stores them in a binary cache,
+        so that subsequent runs on the same file skip parsing and validation.
+
+        Args:
+            filepath (str): Path to the input file containing requests.
+            kind (str, optional): Request kind the file is validated for: "chat", "completions"
+                or "embeddings". Defaults to "chat".
+            cache_dir (str, optional): Directory of the dataset cache. Defaults to ".zorobench_cache".
+            verbose (bool, optional): If True, enables detailed logging. Defaults to False.
+        """
+
+        self._setup_logging(verbose)
+
+        loader = DataLoader(filepath, kind=kind)
+        cache_path = loader.save_cache(cache_dir)
+        sessions = loader.get_sessions()
+
+        print(f"Requests: {len(loader.get_data())}")
+        print(f"Sessions: {len(sessions)}")
+        print(f"Max turns per session: {max((s['turns'] for s in sessions.values()), default=0)}")
+        print(f"Cache: {cache_path}")
+
     def run(
         self,
         model: str,
         filepath: str,
         concurrency: int = 1,
+        kind: str = "chat",
         stream: bool = True,
         output_file: str = "output.json",
         log_responses: bool = False,
+        checkpoint_file: str | None = "checkpoint.jsonl",
+        resume: bool = False,
+        overwrite_checkpoint: bool = False,
+        slo_ttft: float | None = None,
+        slo_itl: float | None = None,
+        slo_window: int = 20,
+        slo_stable_windows: int = 2,
+        max_concurrency: int = 256,
+        trace_file: str = "adaptive_trace.json",
+        cache_dir: str | None = ".zorobench_cache",
         verbose: bool = False,
     ):
         """
@@ -31,31 +85,105 @@ class Root:
         Args:
             model (str): Name of the model to benchmark.
             filepath (str): Path to the input file containing requests.
-            concurrency (int, optional): Number of concurrent requests. Defaults to 1.
+            concurrency (int, optional): Number of concurrent requests. In adaptive mode the initial number
+                of concurrent requests. Defaults to 1.
+            kind (str, optional): Endpoint to benchmark: "chat" for `/v1/chat/completions` or "completions"
+                for `/v1/completions`. Use `embed` for `/v1/embeddings`. Defaults to "chat".
             stream (bool, optional): Whether to stream responses from the model. Defaults to True.
             output_file (str, optional): Path to the JSON file to save benchmark results. Defaults to "output.json".
+            checkpoint_file (str | None, optional): Path to the JSONL file where completed requests are recorded
+                as they finish. Set to None to disable checkpointing. Defaults to "checkpoint.jsonl".
+            resume (bool, optional): If True, skips requests already recorded in the checkpoint file, restores
+                conversation histories and merges the previous results into the report. The data file and
+                the model must be the same as in the interrupted run. Defaults to False.
+            overwrite_checkpoint (bool, optional): If True, starts from scratch even if the checkpoint file
+                contains progress of an interrupted run. Without it, such a run is refused. Defaults to False.
+            slo_ttft (float | None, optional): p95 TTFT SLO in seconds. Setting an SLO enables adaptive mode,
+                in which the concurrency is adjusted at runtime (AIMD) to find the highest load that meets
+                the SLOs. Defaults to None.
+            slo_itl (float | None, optional): p95 ITL SLO in seconds, enables adaptive mode. Defaults to None.
+            slo_window (int, optional): Number of completed requests evaluated before each concurrency
+                adjustment. Defaults to 20.
+            slo_stable_windows (int, optional): Number of consecutive windows at a concurrency that must meet
+                the SLOs before it is increased and for it to be reported as sustainable. Defaults to 2.
+            max_concurrency (int, optional): Upper bound of the concurrency in adaptive mode. Defaults to 256.
+            trace_file (str, optional): Path to the JSON file to save the adaptive mode result and its
+                convergence trace. Defaults to "adaptive_trace.json".
+            cache_dir (str | None, optional): Directory of the dataset cache created by `prepare`. If the input
+                file was prepared and has not changed since, the cache is used instead of parsing the file.
+                Defaults to ".zorobench_cache".
             verbose (bool, optional): If True, enables detailed logging for progress and timing. Defaults to False.
         """
 
-        log_level = logging.INFO if verbose else logging.WARN
-        logging.basicConfig(
-            level=log_level,
-            format="[%(asctime)s] [%(levelname)s]: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
+        self._setup_logging(verbose)
+
+        if kind not in REQUESTERS:
+            raise ValueError(f"Unknown request kind '{kind}'. Supported kinds: {', '.join(REQUESTERS)}.")
 
-        loader = DataLoader(filepath)
+        if resume and checkpoint_file is None:
+            raise ValueError("Resuming a run requires 'checkpoint_file' to be set.")
+
+        loader = DataLoader(filepath, cache_dir=cache_dir, kind=kind)
         request_payloads = loader.get_request_payloads()
         stream = True
 
         pool = AsyncPool(concurrency)
+        requester = REQUESTERS[kind](stream=stream, model=model, log_responses=log_responses)
+
+        previous_stats: list[RequestStatistics] = []
+        callbacks = []
+        if checkpoint_file is not None:
+            checkpoint = Checkpoint(
+                checkpoint_file,
+                data_file=filepath,
+                model=model,
+                resume=resume,
+                overwrite=overwrite_checkpoint,
+            )
+            previous_stats = checkpoint.get_statistics()
+            request_payloads = checkpoint.filter_payloads(request_payloads)
+            for session_id, history in checkpoint.get_histories().items():
+                requester.memory.set_history(session_id, history)
+            logging.info("Remaining requests: %d", len(request_payloads))
+
+            async def write_checkpoint(request_payload, stat: RequestStatistics):
+                history = None
+                if request_payload.session_id:
+                    history = requester.memory.get_history(request_payload.session_id)
+                await checkpoint.write(request_payload, stat, history)
+
+            callbacks.append(write_checkpoint)
+
+        controller = None
+        if slo_ttft is not None or slo_itl is not None:
+            controller = AIMDConcurrencyController(
+                pool,
+                slo_ttft=slo_ttft,
+                slo_itl=slo_itl,
+                window_size=slo_window,
+                stable_windows=slo_stable_windows,
+                max_concurrency=max_concurrency,
+            )
+
+            async def observe(request_payload, stat: RequestStatistics):
+                controller.observe(stat)
+
+            callbacks.append(observe)
+
+        async def on_result(request_payload, stat: RequestStatistics):
+            for callback in callbacks:
+                await callback(request_payload, stat)
 
         async_session_queue = AsyncSessionIDQueue(request_payloads)
-        requester = OpenAIAPIRequester(stream=stream, model=model, log_responses=log_responses)
 
         now = time.perf_counter()
-        stats: list[RequestStatistics] = asyncio.run(pool.run(requester.asend_request, async_session_queue))
+        stats: list[RequestStatistics] = asyncio.run(
+            pool.run(requester.asend_request, async_session_queue, on_result=on_result)
+        )
         end = time.perf_counter()
+        stats = previous_stats + stats
+        if checkpoint_file is not None:
+            checkpoint.complete()
 
         results = []
         count_errors = 0
@@ -79,3 +207,68 @@ class Root:
         RequestStatistics.save_to_json(results, output_file)
         total_time = end - now
         logging.info(f"Total time: {total_time:.4f}")
+
+        if controller is not None:
+            summary = controller.summary()
+            print("Max concurrency:", summary["Max concurrency"])
+            print("Max request rate:", summary["Max request rate"])
+            with open(trace_file, "w") as f:
+                json.dump(summary, f, indent=4)
+
+    def embed(
+        self,
+        model: str,
+        filepath: str,
+        batch_sizes: int | tuple[int, ...] = 1,
+        concurrency: int = 1,
+        output_file: str = "embeddings_output.json",
+        cache_dir: str | None = ".zorobench_cache",
+        verbose: bool = False,
+    ):
+        """
+        Benchmarks the embeddings endpoint with the inputs from a file, once for each batch size,
+        and reports latency and throughput per batch size.
+
+        Args:
+            model (str): Name of the model to benchmark.
+            filepath (str): Path to the input file, each entry with an `input` key.
+            batch_sizes (int | tuple[int, ...], optional): Numbers of inputs sent in one request,
+                e.g. `--batch_sizes 1,8,32`. Defaults to 1.
+            concurrency (int, optional): Number of concurrent requests. Defaults to 1.
+            output_file (str, optional): Path to the JSON file to save benchmark results.
+                Defaults to "embeddings_output.json".
+            cache_dir (str | None, optional): Directory of the dataset cache created by `prepare`.
+                Defaults to ".zorobench_cache".
+            verbose (bool, optional): If True, enables detailed logging for progress and timing. Defaults to False.
+        """
+
+        self._setup_logging(verbose)
+
+        if isinstance(batch_sizes, int):
+            batch_sizes = (batch_sizes,)
+
+        loader = DataLoader(filepath, cache_dir=cache_dir, kind="embeddings")
+        requester = OpenAIEmbeddingsRequester(model=model)
+        pool = AsyncPool(concurrency)
+
+        async def run_batch_sizes() -> dict[str, dict]:
+            report = {}
+            for batch_size in batch_sizes:
+                request_payloads = loader.get_batched_request_payloads(batch_size)
+                async_session_queue = AsyncSessionIDQueue(request_payloads)
+
+                now = time.perf_counter()
+                stats: list[RequestStatistics] = await pool.run(requester.asend_request, async_session_queue)
+                end = time.perf_counter()
+
+                report[str(batch_size)] = RequestStatistics.throughput_summary(stats, end - now)
+                logging.info(f"Batch size {batch_size}: {len(stats)} requests in {end - now:.4f}s")
+            return report
+
+        report = asyncio.run(run_batch_sizes())
+
+        for batch_size, summary in report.items():
+            print(f"Batch size {batch_size}:", summary)
+
+        with open(output_file, "w") as f:
+            json.dump(report, f, indent=4)
@@ -4,9 +4,9 @@ import os
 
 
 class AsyncFileWriter:
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, append: bool = False):
         self.filename = filename
-        if os.path.exists(self.filename):
+        if not append and os.path.exists(self.filename):
             os.remove(self.filename)
         self.lock = asyncio.Lock()
 
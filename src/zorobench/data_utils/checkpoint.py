@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+
+from pathlib import Path
+from typing import Any
+from .async_writer import AsyncFileWriter
+from ..async_utils.async_session_queue import RequestPayload
+from ..requester.request_statistics import RequestStatistics
+
+COMPLETED_RECORD = json.dumps({"completed": True})
+
+
+class Checkpoint:
+    """
+    Append-only JSONL log of completed requests.
+
+    The first line is a header identifying the run (size and modification time of the data file,
+    as in the dataset cache manifest, and the model).
+    Each following line holds the payload index, its statistics and, for sessions, the
+    messages added to the conversation by the request, so an interrupted run can be resumed
+    without replaying finished payloads. A run that finishes appends a completed record, after
+    which the checkpoint no longer blocks a new run.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        data_file: str | os.PathLike,
+        model: str | None,
+        resume: bool = False,
+        overwrite: bool = False,
+    ):
+        self.file_path = Path(filename)
+        data_stat = os.stat(data_file)
+        self.header = {"file_size": data_stat.st_size, "file_mtime_ns": data_stat.st_mtime_ns, "model": model}
+        self.records: list[dict[str, Any]] = []
+
+        has_progress = self.file_path.exists() and self.file_path.stat().st_size > 0
+        if has_progress and self._is_completed():
+            if resume:
+                logging.warning(f"Checkpoint {self.file_path} belongs to a completed run. Starting from scratch.")
+            has_progress = False
+
+        if resume and has_progress:
+            self.records = self._load_file()
+        elif resume:
+            logging.warning(f"Checkpoint {self.file_path} does not exist. Starting from scratch.")
+        elif has_progress and not overwrite:
+            raise FileExistsError(
+                f"Checkpoint {self.file_path} already exists. Use 'resume' to continue the run "
+                "or 'overwrite_checkpoint' to start from scratch."
+            )
+
+        # Number of messages already recorded per session, used to store only the messages added by each turn.
+        self._history_lengths: dict[str, int] = {
+            session_id: len(history) for session_id, history in self.get_histories().items()
+        }
+
+        self.async_writer = AsyncFileWriter(filename, append=resume and has_progress)
+        if not (resume and has_progress):
+            with self.file_path.open("w", encoding="utf-8") as f:
+                f.write(json.dumps({"header": self.header}) + "\n")
+
+    def _is_completed(self) -> bool:
+        with self.file_path.open("rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - len(COMPLETED_RECORD) - 2))
+            lines = f.read().decode("utf-8", errors="replace").splitlines()
+        return bool(lines) and lines[-1].strip() == COMPLETED_RECORD
+
+    def _load_file(self) -> list[dict[str, Any]]:
+        header = None
+        records = []
+        text = self.file_path.read_text(encoding="utf-8")
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # The last line may be cut short when the process dies mid-write.
+                logging.warning(f"Skipping malformed checkpoint line {line_number} in {self.file_path}.")
+                continue
+            if "header" in record:
+                header = record["header"]
+            elif "completed" in record:
+                continue
+            else:
+                records.append(record)
+
+        if header != self.header:
+            raise ValueError(
+                f"Checkpoint {self.file_path} belongs to a different run (expected {self.header}, found {header}). "
+                "Resume with the same data file and model, or use 'overwrite_checkpoint' to start from scratch."
+            )
+
+        if text and not text.endswith("\n"):
+            # Terminate a truncated line so that appended records start on a new one.
+            with self.file_path.open("a", encoding="utf-8") as f:
+                f.write("\n")
+
+        logging.info(f"Loaded {len(records)} completed requests from checkpoint {self.file_path}.")
+        return records
+
+    def completed_indices(self) -> set[int]:
+        return {record["index"] for record in self.records}
+
+    def get_statistics(self) -> list[RequestStatistics]:
+        return [RequestStatistics.from_dict(record["statistics"]) for record in self.records]
+
+    def get_histories(self) -> dict[str, list[dict[str, Any]]]:
+        """Rebuilds the conversation history of each session by replaying its records in index order."""
+        histories: dict[str, list[dict[str, Any]]] = {}
+        for record in sorted(self.records, key=lambda r: r["index"]):
+            if record.get("session_id") is not None:
+                histories.setdefault(record["session_id"], []).extend(record.get("messages", []))
+        return histories
+
+    def filter_payloads(self, request_payloads: list[RequestPayload]) -> list[RequestPayload]:
+        completed = self.completed_indices()
+        return [payload for payload in request_payloads if payload.index not in completed]
+
+    async def write(
+        self,
+        request_payload: RequestPayload,
+        statistics: RequestStatistics,
+        history: list[dict[str, Any]] | None = None,
+    ) -> None:
+        messages = []
+        session_id = request_payload.session_id
+        if session_id is not None and history is not None:
+            messages = history[self._history_lengths.get(session_id, 0) :]
+            self._history_lengths[session_id] = len(history)
+
+        record = {
+            "index": request_payload.index,
+            "session_id": session_id,
+            "statistics": statistics.to_dict(),
+            "messages": messages,
+        }
+        await self.async_writer.write(json.dumps(record, ensure_ascii=False))
+
+    def complete(self) -> None:
+        """Marks the run as finished, so that the next run may start from scratch."""
+        with self.file_path.open("a", encoding="utf-8") as f:
+            f.write(COMPLETED_RECORD + "\n")
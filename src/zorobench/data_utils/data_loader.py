@@ -2,55 +2,157 @@ import json
 import logging
 
 from pathlib import Path
+from .dataset_cache import DatasetCache, DatasetCacheReader
+from .payload_validator import VALIDATORS
 from ..async_utils.async_session_queue import RequestPayload
 
 
 class DataLoader:
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache_dir: str | None = None, kind: str = "chat"):
+        if kind not in VALIDATORS:
+            raise ValueError(f"Unknown request kind '{kind}'. Supported kinds: {', '.join(VALIDATORS)}.")
+
         self.file_path = Path(file_path)
+        self.kind = kind
+        self.cache = DatasetCache(cache_dir) if cache_dir is not None else None
+        self.cache_reader: DatasetCacheReader | None = None
+        self.file_hash = None
         self.data = []
-        self._load_file()
+        self.sessions = {}
+        self.found_model = False
+        self._load()
 
-    def _load_file(self):
+    def _load(self):
         if not self.file_path.exists():
             raise FileNotFoundError(f"File {self.file_path} does not exist.")
 
-        found_model = False
-        found_stream = False
+        if self.cache is not None:
+            file_hash = self.cache.lookup(self.file_path, self.kind)
+            self.cache_reader = self.cache.load(file_hash, self.kind) if file_hash is not None else None
+            if self.cache_reader is not None:
+                self.file_hash = file_hash
+                self.sessions = self.cache_reader.sessions
+                self.found_model = self.cache_reader.index["found_model"]
+                self._warn_about_keys()
+                return
+
+        self._load_file()
+        self.sessions = DatasetCache.build_session_index([entry.get("session_id") for entry in self.data])
+
+    def _load_file(self):
+        errors = []
+        validate_entry = VALIDATORS[self.kind]
 
         with self.file_path.open("r", encoding="utf-8") as f:
-            for line in f:
+            for line_number, line in enumerate(f, start=1):
                 line = line.strip()
                 if not line:
                     continue  # skip empty lines
                 try:
                     entry = json.loads(line)
                 except json.JSONDecodeError as e:
-                    raise ValueError(f"Error parsing JSON on line: {line}\n{e}")
+                    errors.append(f"Line {line_number}: Error parsing JSON: {e}")
+                    continue
+
+                errors.extend(f"Line {line_number}: {error}" for error in validate_entry(entry))
 
-                if "model" in entry:
-                    found_model = True
-                if "stream" in entry:
-                    found_stream = True
+                if isinstance(entry, dict) and "model" in entry:
+                    self.found_model = True
 
                 self.data.append(entry)
 
-        if found_model:
+        if errors:
+            raise ValueError(f"Invalid entries in {self.file_path}:\n" + "\n".join(errors))
+
+        self._warn_about_keys()
+
+    def _warn_about_keys(self):
+        if self.found_model:
             logging.warning("The file contains the key 'model'. Any defined model may be overwritten.")
-        if found_stream:
-            logging.warning("The file contains the key 'stream'. Stream will be ignored.")
+
+    def get_file_hash(self) -> str:
+        if self.file_hash is None:
+            self.file_hash = DatasetCache.file_hash(self.file_path)
+        return self.file_hash
+
+    def save_cache(self, cache_dir: str | None = None) -> Path:
+        cache = DatasetCache(cache_dir) if cache_dir is not None else self.cache
+        if cache is None:
+            raise ValueError("No 'cache_dir' given.")
+        return cache.save(
+            self.file_path,
+            self.get_file_hash(),
+            self.get_data(),
+            kind=self.kind,
+            found_model=self.found_model,
+        )
 
     def get_data(self) -> list[dict]:
+        if self.cache_reader is not None:
+            return [self.cache_reader.read_record(record) for record in range(len(self.cache_reader))]
         return self.data
 
+    def get_sessions(self) -> dict[str, dict]:
+        return self.sessions
+
+    @staticmethod
+    def _split_entry(entry: dict) -> tuple[str | None, list | None, dict]:
+        params = dict(entry)
+        session_id = params.pop("session_id", None)
+        messages = params.pop("messages", None)
+        return session_id, messages, params
+
+    def _record_loader(self, record: int):
+        def load():
+            _, messages, params = self._split_entry(self.cache_reader.read_record(record))
+            return messages, params
+
+        return load
+
     def _convert_data_into_payloads(self) -> list[RequestPayload]:
         request_payloads = []
-        for dato in self.data:
-            session_id = dato.pop("session_id")
-            messages = dato.pop("messages")
-            params = dato
-            request_payloads.append(RequestPayload(messages, session_id, params))
+        if self.cache_reader is not None:
+            # Records are decoded only when they are sent; the session ids come from the session index.
+            for index, session_id in enumerate(self.cache_reader.get_session_ids()):
+                payload = RequestPayload(None, session_id, {}, index, loader=self._record_loader(index))
+                request_payloads.append(payload)
+            return request_payloads
+
+        for index, dato in enumerate(self.data):
+            session_id, messages, params = self._split_entry(dato)
+            request_payloads.append(RequestPayload(messages, session_id, params, index))
         return request_payloads
 
     def get_request_payloads(self) -> list[RequestPayload]:
         return self._convert_data_into_payloads()
+
+    @staticmethod
+    def _split_items(value) -> list:
+        # A list of strings or of token lists is already a batch, anything else is a single item.
+        if isinstance(value, list) and value and all(isinstance(item, (str, list)) for item in value):
+            return value
+        return [value]
+
+    def get_batched_request_payloads(self, batch_size: int, key: str = "input") -> list[RequestPayload]:
+        """
+        Regroups the items in the `key` parameter of all entries into requests with `batch_size` items each.
+        Only items of entries with identical remaining parameters are batched together.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+
+        # Remaining parameters (serialized, in order of first appearance) -> items of the entries that use them.
+        groups: dict[str, tuple[dict, list]] = {}
+        for payload in self.get_request_payloads():
+            payload.load()
+            items = self._split_items(payload.params.pop(key))
+            params_key = json.dumps(payload.params, sort_keys=True)
+            groups.setdefault(params_key, (payload.params, []))[1].extend(items)
+
+        request_payloads = []
+        for params, items in groups.values():
+            for start in range(0, len(items), batch_size):
+                batch_params = dict(params)
+                batch_params[key] = items[start : start + batch_size]
+                request_payloads.append(RequestPayload(None, None, batch_params, len(request_payloads)))
+        return request_payloads
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+
+from pathlib import Path
+from typing import Any
+
+CACHE_VERSION = 2
+MAGIC = b"ZBC2"
+RECORD_LENGTH = struct.Struct("<I")
+TRAILER = struct.Struct("<Q4s")
+MANIFEST_NAME = "manifest.json"
+
+
+class DatasetCacheReader:
+    """
+    Read access to a cache file written by `DatasetCache.save`.
+
+    The file holds length-prefixed JSON records followed by a JSON index with the byte offset of
+    every record and the session index (session_id -> record numbers, turns). The file is memory
+    mapped and records are only decoded when they are read.
+    """
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+        with cache_path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < len(MAGIC) + TRAILER.size or self._mmap[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{cache_path} is not a dataset cache.")
+        index_offset, magic = TRAILER.unpack_from(self._mmap, len(self._mmap) - TRAILER.size)
+        if magic != MAGIC:
+            raise ValueError(f"{cache_path} is truncated.")
+
+        self.index: dict[str, Any] = json.loads(self._mmap[index_offset : len(self._mmap) - TRAILER.size])
+        self.offsets: list[int] = self.index["offsets"]
+        self.sessions: dict[str, dict[str, Any]] = self.index["sessions"]
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get_session_ids(self) -> list[str | None]:
+        """Session id of every record, taken from the session index without decoding the records."""
+        session_ids: list[str | None] = [None] * len(self.offsets)
+        for session_id, session in self.sessions.items():
+            for record in session["records"]:
+                session_ids[record] = session_id
+        return session_ids
+
+    def read_record(self, record: int) -> dict[str, Any]:
+        offset = self.offsets[record]
+        (length,) = RECORD_LENGTH.unpack_from(self._mmap, offset)
+        start = offset + RECORD_LENGTH.size
+        return json.loads(self._mmap[start : start + length])
+
+
+class DatasetCache:
+    """
+    Binary cache of validated data files, keyed by the SHA-256 of the file content and the request kind.
+
+    Caches are only written by `zorobench prepare`, which also records the size and modification time
+    of the source file in a manifest. A cache is used only while the source file still matches the
+    manifest, so files without a prepared cache are never hashed.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike = ".zorobench_cache"):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def file_hash(file_path: str | os.PathLike) -> str:
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def get_cache_path(self, file_hash: str, kind: str = "chat") -> Path:
+        return self.cache_dir / f"{file_hash}.{kind}.zbc"
+
+    @staticmethod
+    def build_session_index(session_ids: list[str | None]) -> dict[str, dict[str, Any]]:
+        sessions: dict[str, dict[str, Any]] = {}
+        for record, session_id in enumerate(session_ids):
+            if session_id is None:
+                continue
+            session = sessions.setdefault(session_id, {"records": [], "turns": 0})
+            session["records"].append(record)
+            session["turns"] += 1
+        return sessions
+
+    def _read_manifest(self) -> dict[str, Any]:
+        manifest_path = self.cache_dir / MANIFEST_NAME
+        if not manifest_path.exists():
+            return {}
+        try:
+            return json.loads(manifest_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            logging.warning(f"Ignoring corrupted dataset cache manifest {manifest_path}.")
+            return {}
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        # Write to a temporary file first so that an interrupted write never leaves a truncated file behind.
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def lookup(self, file_path: str | os.PathLike, kind: str = "chat") -> str | None:
+        """Returns the file hash of a prepared cache for the file, if the file has not changed since."""
+        entry = self._read_manifest().get(str(Path(file_path).resolve()), {}).get(kind)
+        if entry is None:
+            return None
+
+        stat = os.stat(file_path)
+        if entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            logging.warning(f"{file_path} changed since 'zorobench prepare', the dataset cache is not used.")
+            return None
+        return entry["file_hash"]
+
+    def load(self, file_hash: str, kind: str = "chat") -> DatasetCacheReader | None:
+        cache_path = self.get_cache_path(file_hash, kind)
+        if not cache_path.exists():
+            return None
+
+        try:
+            reader = DatasetCacheReader(cache_path)
+        except (ValueError, KeyError, struct.error) as e:
+            logging.warning(f"Ignoring corrupted dataset cache {cache_path}: {e}")
+            return None
+
+        expected = {"version": CACHE_VERSION, "file_hash": file_hash, "kind": kind}
+        if any(reader.index.get(key) != value for key, value in expected.items()):
+            logging.warning(f"Ignoring incompatible dataset cache {cache_path}.")
+            return None
+
+        logging.info(f"Opened dataset cache {cache_path} with {len(reader)} entries.")
+        return reader
+
+    def save(
+        self,
+        file_path: str | os.PathLike,
+        file_hash: str,
+        data: list[dict[str, Any]],
+        kind: str = "chat",
+        **metadata,
+    ) -> Path:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_path = self.get_cache_path(file_hash, kind)
+
+        offsets = []
+        tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(MAGIC)
+            for entry in data:
+                record = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                offsets.append(f.tell())
+                f.write(RECORD_LENGTH.pack(len(record)))
+                f.write(record)
+
+            index = {
+                "version": CACHE_VERSION,
+                "file_hash": file_hash,
+                "kind": kind,
+                "offsets": offsets,
+                "sessions": self.build_session_index([entry.get("session_id") for entry in data]),
+                **metadata,
+            }
+            index_offset = f.tell()
+            f.write(json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+            f.write(TRAILER.pack(index_offset, MAGIC))
+        os.replace(tmp_path, cache_path)
+
+        stat = os.stat(file_path)
+        manifest = self._read_manifest()
+        manifest.setdefault(str(Path(file_path).resolve()), {})[kind] = {
+            "file_hash": file_hash,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        self._atomic_write(self.cache_dir / MANIFEST_NAME, json.dumps(manifest, indent=4).encode("utf-8"))
+        return cache_path
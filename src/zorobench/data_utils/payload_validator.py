@@ -0,0 +1,148 @@
+import inspect
+
+from openai.resources.chat.completions import AsyncCompletions as AsyncChatCompletions
+from openai.resources.completions import AsyncCompletions
+from openai.resources.embeddings import AsyncEmbeddings
+
+CHAT_ROLES = {"system", "developer", "user", "assistant", "tool", "function"}
+
+NUMBER = (int, float)
+
+# Expected JSON types of the request parameters that are commonly set in data files.
+PARAM_TYPES: dict[str, type | tuple[type, ...]] = {
+    "model": str,
+    "max_tokens": int,
+    "max_completion_tokens": int,
+    "n": int,
+    "seed": int,
+    "top_logprobs": int,
+    "temperature": NUMBER,
+    "top_p": NUMBER,
+    "presence_penalty": NUMBER,
+    "frequency_penalty": NUMBER,
+    "logprobs": bool,
+    "parallel_tool_calls": bool,
+    "store": bool,
+    "stop": (str, list),
+    "tool_choice": (str, dict),
+    "tools": list,
+    "modalities": list,
+    "response_format": dict,
+    "stream_options": dict,
+    "logit_bias": dict,
+    "metadata": dict,
+    "extra_body": dict,
+    "reasoning_effort": str,
+    "service_tier": str,
+    "user": str,
+    "prompt": (str, list),
+    "best_of": int,
+    "echo": bool,
+    "suffix": str,
+    "input": (str, list),
+    "dimensions": int,
+    "encoding_format": str,
+}
+
+
+def _keyword_params(create) -> set[str]:
+    return {
+        name
+        for name, parameter in inspect.signature(create).parameters.items()
+        if parameter.kind == inspect.Parameter.KEYWORD_ONLY
+    }
+
+
+# Keyword arguments accepted by the `create` method of each request kind in the installed openai version.
+CHAT_PARAMS = _keyword_params(AsyncChatCompletions.create) - {"messages"}
+COMPLETIONS_PARAMS = _keyword_params(AsyncCompletions.create)
+EMBEDDINGS_PARAMS = _keyword_params(AsyncEmbeddings.create)
+
+
+def _type_name(expected: type | tuple[type, ...]) -> str:
+    if isinstance(expected, tuple):
+        return " or ".join(t.__name__ for t in expected)
+    return expected.__name__
+
+
+def _check_type(value, expected: type | tuple[type, ...]) -> bool:
+    # bool is a subclass of int, but `true` is not a valid token count.
+    if isinstance(value, bool) and expected is not bool:
+        return False
+    return isinstance(value, expected)
+
+
+def _validate_messages(messages) -> list[str]:
+    if not isinstance(messages, list) or not messages:
+        return ["'messages' must be a non-empty list."]
+
+    errors = []
+    for i, message in enumerate(messages):
+        if not isinstance(message, dict):
+            errors.append(f"messages[{i}] must be an object.")
+            continue
+        role = message.get("role")
+        if role not in CHAT_ROLES:
+            errors.append(f"messages[{i}] has invalid role {role!r}.")
+        content = message.get("content")
+        if content is None:
+            if role != "assistant" or "tool_calls" not in message:
+                errors.append(f"messages[{i}] is missing 'content'.")
+        elif not isinstance(content, (str, list)):
+            errors.append(f"messages[{i}].content must be str or list, got {type(content).__name__}.")
+    return errors
+
+
+def _validate_entry(entry, params: set[str], required: str, session_required: bool) -> list[str]:
+    if not isinstance(entry, dict):
+        return [f"Entry must be an object, got {type(entry).__name__}."]
+
+    errors = []
+    if "session_id" not in entry:
+        if session_required:
+            errors.append("Missing 'session_id' key.")
+    elif entry["session_id"] is not None and not isinstance(entry["session_id"], str):
+        errors.append(f"'session_id' must be str or null, got {type(entry['session_id']).__name__}.")
+
+    if required not in entry:
+        errors.append(f"Missing {required!r} key.")
+
+    for key, value in entry.items():
+        if key == "session_id":
+            continue
+        if key == "stream":
+            errors.append("Parameter 'stream' is set by zorobench and must not be defined in the data file.")
+        elif key == "messages" and required == "messages":
+            errors.extend(_validate_messages(value))
+        elif key not in params:
+            errors.append(f"Unknown parameter {key!r}. Server-specific parameters belong into 'extra_body'.")
+        elif key in PARAM_TYPES and not _check_type(value, PARAM_TYPES[key]):
+            errors.append(
+                f"Parameter {key!r} must be {_type_name(PARAM_TYPES[key])}, got {type(value).__name__} {value!r}."
+            )
+    return errors
+
+
+def validate_chat_entry(entry) -> list[str]:
+    """Validates one data file entry against the chat-completions request schema.
+
+    Returns a list of error messages, empty if the entry is valid.
+    """
+    return _validate_entry(entry, CHAT_PARAMS, "messages", session_required=True)
+
+
+def validate_completions_entry(entry) -> list[str]:
+    """Validates one data file entry against the completions request schema."""
+    return _validate_entry(entry, COMPLETIONS_PARAMS, "prompt", session_required=False)
+
+
+def validate_embeddings_entry(entry) -> list[str]:
+    """Validates one data file entry against the embeddings request schema."""
+    return _validate_entry(entry, EMBEDDINGS_PARAMS, "input", session_required=False)
+
+
+VALIDATORS = {
+    "chat": validate_chat_entry,
+    "completions": validate_completions_entry,
+    "embeddings": validate_embeddings_entry,
+}
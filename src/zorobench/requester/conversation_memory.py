@@ -27,6 +27,9 @@ class ConversationMemory:
     def get_history(self, session_id: str) -> list[dict[str, str]]:
         return self._sessions[session_id]
 
+    def set_history(self, session_id: str, history: list[dict[str, str]]) -> None:
+        self._sessions[session_id] = list(history)
+
     def clear(self, session_id: str) -> None:
         self._sessions[session_id] = []
 
@@ -93,6 +93,17 @@ class OpenAIAPIRequester:
                         request_response.tool_calls[index].function.arguments = ""
                     request_response.tool_calls[index].function.arguments += tool_call.function.arguments
 
+    def _process_response(self, response, request_response: RequestResponse):
+        message = response.choices[0].message if response.choices else None
+
+        if message:
+            request_response.content = message.content
+            for i, tool_call in enumerate(message.tool_calls or []):
+                request_response.tool_calls[i] = tool_call
+
+    async def _create(self, messages: list[dict[str, str]] | None, stream: bool, params: dict[str, str]):
+        return await self.aclient.chat.completions.create(messages=messages, stream=stream, **params)
+
     def _process_params(self, params: dict):
         if self.model:
             params["model"] = self.model
@@ -112,7 +123,7 @@ class OpenAIAPIRequester:
         completions_tokens = None
 
         timer.start()
-        response_stream = await self.aclient.chat.completions.create(messages=messages, stream=True, **params)
+        response_stream = await self._create(messages, True, params)
         async for chunk in response_stream:
             self._process_chunk(chunk, timer, request_response)
             if chunk.usage:
@@ -149,16 +160,10 @@ class OpenAIAPIRequester:
         completions_tokens = None
 
         timer.start()
-        response = await self.aclient.chat.completions.create(messages=messages, stream=False, **params)
+        response = await self._create(messages, False, params)
         e2e, ttft, itl_list = timer.finalize()
 
-        message = response.choices[0].message if response.choices else None
-
-        if message:
-            request_response.content = message.content
-            tool_calls = message.tool_calls or []
-        for i, tool_call in enumerate(tool_calls):
-            request_response.tool_calls[i] = tool_call
+        self._process_response(response, request_response)
 
         completions_tokens = response.usage.completion_tokens
         if completions_tokens is None:
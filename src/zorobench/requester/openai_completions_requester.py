@@ -0,0 +1,30 @@
+from .request_statistics import RequestStatistics
+from .request_timer import RequestTimer
+from .openai_api_requester import OpenAIAPIRequester, RequestResponse
+
+
+class OpenAICompletionsRequester(OpenAIAPIRequester):
+    """
+    Requester for the `/v1/completions` endpoint. The prompt is passed in the `prompt` parameter.
+    """
+
+    async def _create(self, messages: list[dict[str, str]] | None, stream: bool, params: dict[str, str]):
+        return await self.aclient.completions.create(stream=stream, **params)
+
+    def _process_chunk(self, chunk, timer: RequestTimer, request_response: RequestResponse):
+        if chunk.choices:
+            timer.mark_token()
+            request_response.content += chunk.choices[0].text or ""
+
+    def _process_response(self, response, request_response: RequestResponse):
+        if response.choices:
+            request_response.content = response.choices[0].text
+
+    async def asend_request(
+        self,
+        messages: list[dict[str, str]] | None = None,
+        session_id: str | None = None,
+        params: dict[str, str] = {},
+    ) -> RequestStatistics:
+        # Prompts are independent requests, there is no conversation history to keep.
+        return await super().asend_request(messages, None, params)
@@ -0,0 +1,57 @@
+import logging
+import time
+
+from openai import APIStatusError
+from .request_statistics import RequestStatistics
+from .request_timer import RequestTimer
+from .openai_api_requester import OpenAIAPIRequester
+
+
+class OpenAIEmbeddingsRequester(OpenAIAPIRequester):
+    """
+    Requester for the `/v1/embeddings` endpoint. The inputs are passed in the `input` parameter.
+
+    The returned statistics contain the number of embedded inputs in `num_items`
+    and the number of prompt tokens in `token_num`.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ):
+        super().__init__(stream=False, model=model, api_key=api_key, base_url=base_url)
+
+    async def asend_request(
+        self,
+        messages: list[dict[str, str]] | None = None,
+        session_id: str | None = None,
+        params: dict[str, str] = {},
+    ) -> RequestStatistics:
+        timer = RequestTimer()
+
+        self._process_params(params)
+
+        try:
+            timer.start()
+            response = await self.aclient.embeddings.create(**params)
+            e2e, _, _ = timer.finalize()
+
+            if response.usage is None:
+                raise RuntimeError("Failed to retrieve the number of tokens from the response.")
+
+            logging.info(f"E2E: {e2e:.4f}s, items: {len(response.data)}")
+            result = RequestStatistics(e2e, None, (), response.usage.prompt_tokens, 200, len(response.data))
+        except APIStatusError as api_err:
+            status_code = self._log_error(
+                api_err, messages, params, session_id, timer.start_time, api_err.status_code, api_err.request_id
+            )
+            e2e = time.perf_counter() - timer.start_time
+            result = RequestStatistics(e2e, None, None, None, status_code)
+        except RuntimeError as runtime_err:
+            e2e = time.perf_counter() - timer.start_time
+            logging.error(f"Runtime error occurred: {runtime_err}")
+            result = RequestStatistics(e2e, None, None, None, 600)
+
+        return result
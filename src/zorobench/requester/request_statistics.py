@@ -1,7 +1,7 @@
 import json
 import numpy as np
 
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
 
 @dataclass(frozen=True)
@@ -11,6 +11,22 @@ class RequestStatistics:
     itl: tuple[float, ...]
     token_num: int | None
     status_code: int | None = None
+    num_items: int | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(data: dict) -> "RequestStatistics":
+        itl = data.get("itl")
+        return RequestStatistics(
+            e2e=data["e2e"],
+            ttft=data.get("ttft"),
+            itl=tuple(itl) if itl is not None else None,
+            token_num=data.get("token_num"),
+            status_code=data.get("status_code"),
+            num_items=data.get("num_items"),
+        )
 
     @staticmethod
     def _describe(values: list[float]) -> dict[str, float]:
@@ -49,6 +65,22 @@ class RequestStatistics:
     def _successful_requests(statistics: list["RequestStatistics"]) -> list["RequestStatistics"]:
         return [s for s in statistics if s.status_code is not None and 200 <= s.status_code < 300]
 
+    @staticmethod
+    def throughput_summary(statistics: list["RequestStatistics"], total_time: float) -> dict:
+        successful = RequestStatistics._successful_requests(statistics)
+
+        nan = float("nan")
+        items = sum(s.num_items for s in successful if s.num_items is not None)
+        tokens = sum(s.token_num for s in successful if s.token_num is not None)
+
+        return {
+            "E2E": RequestStatistics._describe([s.e2e for s in successful]),
+            "Requests/s": len(successful) / total_time if total_time > 0 else nan,
+            "Items/s": items / total_time if total_time > 0 else nan,
+            "Tokens/s": tokens / total_time if total_time > 0 else nan,
+            "Status codes": RequestStatistics._status_breakdown(statistics),
+        }
+
     @staticmethod
     def print(statistics: list["RequestStatistics"]) -> None:
         successful = RequestStatistics._successful_requests(statistics)
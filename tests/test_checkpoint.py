@@ -0,0 +1,173 @@
+import asyncio
+import json
+
+import pytest
+
+from zorobench.async_utils.async_session_queue import RequestPayload
+from zorobench.cli import root
+from zorobench.data_utils.checkpoint import Checkpoint
+from zorobench.requester.conversation_memory import ConversationMemory
+from zorobench.requester.request_statistics import RequestStatistics
+
+MODEL = "test-model"
+
+HISTORY = [
+    {"role": "user", "content": "Hi"},
+    {"role": "assistant", "content": "Hello"},
+    {"role": "user", "content": "Bye"},
+    {"role": "assistant", "content": "Goodbye"},
+]
+
+
+def _checkpoint(checkpoint_file, **kwargs):
+    data_file = checkpoint_file.with_name("data.jsonl")
+    if not data_file.exists():
+        data_file.write_text('{"session_id": "sess1", "messages": [{"role": "user", "content": "Hi"}]}\n')
+    kwargs.setdefault("data_file", data_file)
+    kwargs.setdefault("model", MODEL)
+    return Checkpoint(str(checkpoint_file), **kwargs)
+
+
+def _header(checkpoint_file):
+    stat = checkpoint_file.with_name("data.jsonl").stat()
+    return {"file_size": stat.st_size, "file_mtime_ns": stat.st_mtime_ns, "model": MODEL}
+
+
+def _write_records(checkpoint_file):
+    checkpoint = _checkpoint(checkpoint_file)
+    records = [
+        (
+            RequestPayload([{"role": "user", "content": "Hi"}], "sess1", {}, 0),
+            RequestStatistics(e2e=1.0, ttft=0.2, itl=(0.1, 0.1), token_num=3, status_code=200),
+            HISTORY[:2],
+        ),
+        (
+            RequestPayload([{"role": "user", "content": "Bye"}], "sess1", {}, 2),
+            RequestStatistics(e2e=2.0, ttft=None, itl=None, token_num=None, status_code=500),
+            HISTORY,
+        ),
+    ]
+
+    async def write_all():
+        for payload, stat, history in records:
+            await checkpoint.write(payload, stat, history)
+
+    asyncio.run(write_all())
+    return records
+
+
+def test_resume_restores_completed_requests(tmp_path):
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    records = _write_records(checkpoint_file)
+
+    checkpoint = _checkpoint(checkpoint_file, resume=True)
+
+    assert checkpoint.completed_indices() == {0, 2}
+    assert checkpoint.get_statistics() == [stat for _, stat, _ in records]
+    assert checkpoint.get_histories() == {"sess1": HISTORY}
+
+    payloads = [RequestPayload([], "sess1", {}, i) for i in range(4)]
+    assert [p.index for p in checkpoint.filter_payloads(payloads)] == [1, 3]
+
+
+def test_records_store_only_messages_added_by_turn(tmp_path):
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    _write_records(checkpoint_file)
+
+    lines = [json.loads(line) for line in checkpoint_file.read_text(encoding="utf-8").splitlines()]
+
+    assert lines[0] == {"header": _header(checkpoint_file)}
+    assert [line["messages"] for line in lines[1:]] == [HISTORY[:2], HISTORY[2:]]
+
+
+def test_resume_appends_and_skips_truncated_line(tmp_path):
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    _write_records(checkpoint_file)
+    with checkpoint_file.open("a", encoding="utf-8") as f:
+        f.write('{"index": 3, "session_id"')
+
+    checkpoint = _checkpoint(checkpoint_file, resume=True)
+    assert checkpoint.completed_indices() == {0, 2}
+
+    stat = RequestStatistics(e2e=1.5, ttft=0.3, itl=(), token_num=1, status_code=200)
+    asyncio.run(checkpoint.write(RequestPayload([], None, {}, 1), stat))
+
+    lines = checkpoint_file.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1])["index"] == 1
+    assert _checkpoint(checkpoint_file, resume=True).completed_indices() == {0, 1, 2}
+
+
+def test_resume_refuses_checkpoint_of_different_model(tmp_path):
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    _write_records(checkpoint_file)
+
+    with pytest.raises(ValueError):
+        _checkpoint(checkpoint_file, resume=True, model="other-model")
+
+
+def test_resume_refuses_checkpoint_of_changed_data_file(tmp_path):
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    _write_records(checkpoint_file)
+    with checkpoint_file.with_name("data.jsonl").open("a", encoding="utf-8") as f:
+        f.write('{"session_id": "sess2", "messages": [{"role": "user", "content": "Hi"}]}\n')
+
+    with pytest.raises(ValueError):
+        _checkpoint(checkpoint_file, resume=True)
+
+
+def test_new_run_refuses_to_overwrite_progress(tmp_path):
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    _write_records(checkpoint_file)
+
+    with pytest.raises(FileExistsError):
+        _checkpoint(checkpoint_file)
+
+    checkpoint = _checkpoint(checkpoint_file, overwrite=True)
+
+    assert checkpoint.completed_indices() == set()
+    assert checkpoint_file.read_text(encoding="utf-8").splitlines() == [
+        json.dumps({"header": _header(checkpoint_file)})
+    ]
+
+
+def test_completed_checkpoint_does_not_block_next_run(tmp_path):
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    _write_records(checkpoint_file)
+    _checkpoint(checkpoint_file, resume=True).complete()
+
+    checkpoint = _checkpoint(checkpoint_file)
+    assert checkpoint.completed_indices() == set()
+
+    assert _checkpoint(checkpoint_file, resume=True).completed_indices() == set()
+
+
+class _StubRequester:
+    def __init__(self, **kwargs):
+        self.memory = ConversationMemory()
+
+    async def asend_request(self, messages, session_id=None, params={}):
+        if session_id:
+            self.memory.add_messages(session_id, messages)
+            self.memory.add_assistant_message(session_id, "ok")
+        return RequestStatistics(e2e=0.1, ttft=0.05, itl=(0.01,), token_num=2, status_code=200)
+
+
+def test_run_twice_in_a_row(tmp_path, monkeypatch):
+    data_file = tmp_path / "data.jsonl"
+    entries = [{"session_id": f"sess{i % 2}", "messages": [{"role": "user", "content": f"Hi {i}"}]} for i in range(4)]
+    data_file.write_text("\n".join(json.dumps(entry) for entry in entries) + "\n", encoding="utf-8")
+    output_file = tmp_path / "output.json"
+    checkpoint_file = tmp_path / "checkpoint.jsonl"
+    monkeypatch.setitem(root.REQUESTERS, "chat", _StubRequester)
+
+    for _ in range(2):
+        root.Root().run(
+            MODEL,
+            str(data_file),
+            output_file=str(output_file),
+            checkpoint_file=str(checkpoint_file),
+            cache_dir=None,
+        )
+        lines = checkpoint_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1 + len(entries) + 1
+        assert json.loads(lines[-1]) == {"completed": True}
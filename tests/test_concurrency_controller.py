@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+
+from zorobench.async_utils.async_session_queue import AsyncSessionIDQueue, RequestPayload
+from zorobench.async_utils import concurrency_controller
+from zorobench.async_utils.asyncpool import AsyncPool
+from zorobench.async_utils.concurrency_controller import AIMDConcurrencyController
+from zorobench.requester.request_statistics import RequestStatistics
+
+
+def _stat(ttft, status_code=200):
+    return RequestStatistics(e2e=ttft + 0.9, ttft=ttft, itl=(0.1,) * 9, token_num=10, status_code=status_code)
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    class Clock:
+        now = 0.0
+
+    monkeypatch.setattr(concurrency_controller.time, "perf_counter", lambda: Clock.now)
+    return Clock
+
+
+def _complete(controller, clock, ttft, status_code=200):
+    clock.now += 10.0
+    controller.observe(_stat(ttft, status_code))
+
+
+def test_aimd_increases_additively_and_decreases_multiplicatively(clock):
+    pool = AsyncPool(4)
+    controller = AIMDConcurrencyController(pool, slo_ttft=0.5, window_size=2, max_concurrency=5, stable_windows=1)
+
+    for ttft in (0.1, 0.2, 0.1, 0.2):
+        _complete(controller, clock, ttft)
+    assert pool.concurrency == 5
+
+    _complete(controller, clock, 0.1)
+    _complete(controller, clock, 0.9)
+    assert pool.concurrency == 2
+
+    _complete(controller, clock, 0.1)
+    _complete(controller, clock, 0.1, status_code=500)
+    assert pool.concurrency == 1
+
+    assert [step["concurrency"] for step in controller.summary()["Trace"]] == [4, 5, 5, 2]
+
+
+def test_requests_sent_before_adjustment_are_ignored(clock):
+    pool = AsyncPool(8)
+    controller = AIMDConcurrencyController(pool, slo_ttft=0.5, window_size=2, stable_windows=1)
+
+    _complete(controller, clock, 0.9)
+    _complete(controller, clock, 0.9)
+    assert pool.concurrency == 4
+
+    # Still in flight from concurrency 8: sent before the decrease.
+    clock.now += 0.5
+    controller.observe(_stat(0.9))
+    controller.observe(_stat(0.9))
+    assert pool.concurrency == 4
+    assert len(controller.trace) == 1
+
+    _complete(controller, clock, 0.1)
+    _complete(controller, clock, 0.1)
+    assert pool.concurrency == 5
+
+
+def test_summary_reports_concurrency_stable_over_last_windows(clock):
+    pool = AsyncPool(4)
+    controller = AIMDConcurrencyController(pool, slo_ttft=0.5, window_size=1, stable_windows=2)
+
+    # 4, 4 -> 5, 5 (fails) -> 2, 2 -> 3, 3 -> 4, 4 -> 5
+    for ttft in (0.1, 0.1, 0.1, 0.9, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1):
+        _complete(controller, clock, ttft)
+
+    summary = controller.summary()
+
+    # 5 passed once but failed on its last visit.
+    assert pool.concurrency == 5
+    assert summary["Max concurrency"] == 4
+    assert summary["Max request rate"] == pytest.approx(0.1)
+
+
+def test_increase_waits_for_stable_windows(clock):
+    pool = AsyncPool(4)
+    controller = AIMDConcurrencyController(pool, slo_ttft=0.5, window_size=1, stable_windows=2)
+
+    for _ in range(10):
+        _complete(controller, clock, 0.1)
+
+    summary = controller.summary()
+
+    assert [step["concurrency"] for step in summary["Trace"]] == [4, 4, 5, 5, 6, 6, 7, 7, 8, 8]
+    assert pool.concurrency == 9
+    assert summary["Max concurrency"] == 8
+    assert summary["Max request rate"] == pytest.approx(0.1)
+
+
+def test_controller_requires_slo():
+    with pytest.raises(ValueError):
+        AIMDConcurrencyController(AsyncPool(1))
+
+
+def test_pool_changes_concurrency_while_running():
+    pool = AsyncPool(1)
+    payloads = [RequestPayload([], f"sess{i}", {}, i) for i in range(30)]
+    running = 0
+    max_running = []
+
+    async def func(messages, session_id, params):
+        nonlocal running
+        running += 1
+        max_running.append(running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return session_id
+
+    async def on_result(request_payload, result):
+        if request_payload.index == 5:
+            pool.set_concurrency(4)
+        if request_payload.index == 20:
+            pool.set_concurrency(2)
+
+    results = asyncio.run(pool.run(func, AsyncSessionIDQueue(payloads), on_result=on_result))
+
+    assert sorted(results) == sorted(f"sess{i}" for i in range(30))
+    assert max(max_running) == 4
+    assert max_running[:6] == [1] * 6
+    assert max_running[-1] <= 2
+
+
+def test_pool_changes_concurrency_while_sessions_are_busy():
+    # 10 sessions with 6 turns each: with 12 workers, 2 of them have to wait for a busy session.
+    pool = AsyncPool(12)
+    payloads = [RequestPayload([], f"sess{i % 10}", {}, i) for i in range(60)]
+    completed = 0
+    running = 0
+    max_running = []
+
+    async def func(messages, session_id, params):
+        nonlocal running
+        running += 1
+        max_running.append((completed, running, pool._num_workers))
+        await asyncio.sleep(0.01)
+        running -= 1
+        return session_id
+
+    async def on_result(request_payload, result):
+        nonlocal completed
+        completed += 1
+        if completed == 10:
+            pool.set_concurrency(4)
+        if completed == 30:
+            pool.set_concurrency(9)
+
+    results = asyncio.run(pool.run(func, AsyncSessionIDQueue(payloads), on_result=on_result))
+
+    assert len(results) == 60
+    assert max(r for c, r, _ in max_running if c < 10) == 10
+    assert max(r for c, r, _ in max_running if 14 <= c < 30) == 4
+    assert max(r for c, r, _ in max_running if c >= 30) == 9
+    assert max(w for c, _, w in max_running if c >= 30) == 9
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+from zorobench.data_utils.data_loader import DataLoader
+from zorobench.data_utils.dataset_cache import DatasetCache
+
+
+def _write_jsonl(path, entries):
+    path.write_text("\n".join(json.dumps(entry) for entry in entries) + "\n", encoding="utf-8")
+
+
+ENTRIES = [
+    {"session_id": "sess1", "messages": [{"role": "user", "content": "Hello!"}], "max_tokens": 50},
+    {"session_id": "sess2", "messages": [{"role": "user", "content": "Hi!"}], "temperature": 0.5},
+    {"session_id": "sess1", "messages": [{"role": "user", "content": "Bye!"}], "max_tokens": 20},
+]
+
+
+def test_invalid_entries_are_reported_upfront(tmp_path):
+    data_file = tmp_path / "data.jsonl"
+    _write_jsonl(
+        data_file,
+        [
+            ENTRIES[0],
+            {"session_id": "sess1", "messages": [{"role": "user", "content": "Ok"}], "max_tokens": "50"},
+            {"session_id": "sess2", "messages": [{"role": "robot", "content": "Hi"}], "top_k": 5},
+            {"messages": []},
+            {"session_id": "sess3", "messages": [{"role": "user", "content": "Hi"}], "stream": True},
+        ],
+    )
+    with data_file.open("a", encoding="utf-8") as f:
+        f.write('{"session_id": "sess4", "messages": \n')
+
+    with pytest.raises(ValueError) as exc_info:
+        DataLoader(data_file)
+
+    message = str(exc_info.value)
+    assert "Line 2: Parameter 'max_tokens' must be int, got str '50'." in message
+    assert "Line 3: messages[0] has invalid role 'robot'." in message
+    assert "Line 3: Unknown parameter 'top_k'" in message
+    assert "Line 4: Missing 'session_id' key." in message
+    assert "Line 4: 'messages' must be a non-empty list." in message
+    assert "Line 5: Parameter 'stream' is set by zorobench" in message
+    assert "Line 6: Error parsing JSON" in message
+    assert "Line 1:" not in message
+
+
+def test_session_index(tmp_path):
+    data_file = tmp_path / "data.jsonl"
+    _write_jsonl(data_file, ENTRIES)
+
+    loader = DataLoader(data_file)
+
+    assert loader.get_sessions() == {
+        "sess1": {"records": [0, 2], "turns": 2},
+        "sess2": {"records": [1], "turns": 1},
+    }
+
+
+def test_prepared_cache_is_used_for_unchanged_file(tmp_path, monkeypatch):
+    data_file = tmp_path / "data.jsonl"
+    cache_dir = tmp_path / "cache"
+    _write_jsonl(data_file, ENTRIES)
+
+    cache_path = DataLoader(data_file).save_cache(str(cache_dir))
+    assert cache_path == cache_dir / f"{DatasetCache.file_hash(data_file)}.chat.zbc"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("File should be neither parsed nor hashed when a prepared cache exists.")
+
+    monkeypatch.setattr(DataLoader, "_load_file", fail)
+    monkeypatch.setattr(DatasetCache, "file_hash", fail)
+    loader = DataLoader(data_file, cache_dir=str(cache_dir))
+
+    assert loader.get_sessions() == {
+        "sess1": {"records": [0, 2], "turns": 2},
+        "sess2": {"records": [1], "turns": 1},
+    }
+    payloads = loader.get_request_payloads()
+    assert [(p.session_id, p.index) for p in payloads] == [("sess1", 0), ("sess2", 1), ("sess1", 2)]
+
+    for payload in payloads:
+        payload.load()
+    assert [p.params for p in payloads] == [{"max_tokens": 50}, {"temperature": 0.5}, {"max_tokens": 20}]
+    assert payloads[1].messages == ENTRIES[1]["messages"]
+
+
+def test_cache_is_not_used_without_prepare_or_after_change(tmp_path):
+    data_file = tmp_path / "data.jsonl"
+    cache_dir = tmp_path / "cache"
+    _write_jsonl(data_file, ENTRIES)
+
+    assert DataLoader(data_file, cache_dir=str(cache_dir)).cache_reader is None
+    assert not cache_dir.exists()
+
+    DataLoader(data_file).save_cache(str(cache_dir))
+    _write_jsonl(data_file, ENTRIES[:1])
+    loader = DataLoader(data_file, cache_dir=str(cache_dir))
+
+    assert loader.cache_reader is None
+    assert loader.get_data() == ENTRIES[:1]
+
+
+def test_corrupted_cache_is_ignored(tmp_path):
+    data_file = tmp_path / "data.jsonl"
+    cache_dir = tmp_path / "cache"
+    _write_jsonl(data_file, ENTRIES)
+
+    cache_path = DataLoader(data_file).save_cache(str(cache_dir))
+    cache_path.write_bytes(cache_path.read_bytes()[:-3])
+    loader = DataLoader(data_file, cache_dir=str(cache_dir))
+
+    assert loader.cache_reader is None
+    assert loader.get_data() == ENTRIES
+
+
+def test_embedding_inputs_are_regrouped_into_batches(tmp_path):
+    data_file = tmp_path / "data.jsonl"
+    _write_jsonl(
+        data_file,
+        [
+            {"input": "a", "dimensions": 8},
+            {"input": ["b", "c", "d"]},
+            {"input": "e", "dimensions": 8},
+            {"input": [1, 2, 3]},
+        ],
+    )
+
+    loader = DataLoader(data_file, kind="embeddings")
+    payloads = loader.get_batched_request_payloads(2)
+
+    # Items are only batched with items of entries that have the same parameters.
+    assert [p.params for p in payloads] == [
+        {"input": ["a", "e"], "dimensions": 8},
+        {"input": ["b", "c"]},
+        {"input": ["d", [1, 2, 3]]},
+    ]
+    assert [(p.session_id, p.index) for p in payloads] == [(None, 0), (None, 1), (None, 2)]
+    assert [p.params for p in loader.get_batched_request_payloads(8)] == [
+        {"input": ["a", "e"], "dimensions": 8},
+        {"input": ["b", "c", "d", [1, 2, 3]]},
+    ]
+
+
+def test_entries_are_validated_for_request_kind(tmp_path):
+    data_file = tmp_path / "data.jsonl"
+    _write_jsonl(data_file, [{"prompt": "Hello", "max_tokens": 5}, {"input": "Hello"}])
+
+    with pytest.raises(ValueError) as exc_info:
+        DataLoader(data_file, kind="completions")
+
+    message = str(exc_info.value)
+    assert "Line 2: Missing 'prompt' key." in message
+    assert "Line 2: Unknown parameter 'input'" in message
+    assert "Line 1:" not in message
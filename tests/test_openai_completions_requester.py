@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from zorobench.requester.openai_completions_requester import OpenAICompletionsRequester
+
+
+def _chunk(text=None, completion_tokens=None):
+    choices = [SimpleNamespace(text=text)] if text is not None else []
+    usage = SimpleNamespace(completion_tokens=completion_tokens) if completion_tokens is not None else None
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class StubCompletions:
+    def __init__(self, texts):
+        self.texts = texts
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs["stream"]:
+            return self._stream()
+        return SimpleNamespace(
+            choices=[SimpleNamespace(text="".join(self.texts))],
+            usage=SimpleNamespace(completion_tokens=len(self.texts)),
+        )
+
+    async def _stream(self):
+        for text in self.texts:
+            yield _chunk(text)
+        yield _chunk(completion_tokens=len(self.texts))
+
+
+@pytest.fixture()
+def requester_factory():
+    def create(stream, texts=("Hel", "lo", "!")):
+        requester = OpenAICompletionsRequester(stream=stream, model="test-model", api_key="test")
+        requester.aclient = SimpleNamespace(completions=StubCompletions(list(texts)))
+        return requester
+
+    return create
+
+
+def test_stream_request_counts_text_chunks_as_tokens(requester_factory):
+    requester = requester_factory(stream=True)
+
+    result = asyncio.run(requester.asend_request(None, "sess1", {"prompt": "Say hello", "max_tokens": 5}))
+
+    assert result.status_code == 200
+    assert result.token_num == 3
+    assert result.ttft is not None
+    assert len(result.itl) == 2
+
+    call = requester.aclient.completions.calls[0]
+    assert call["prompt"] == "Say hello"
+    assert call["model"] == "test-model"
+    assert call["stream_options"] == {"include_usage": True}
+    assert "messages" not in call
+
+    # Prompts are independent, nothing is kept in the conversation memory.
+    assert requester.memory.get_history("sess1") == []
+
+
+def test_non_stream_request_reads_usage(requester_factory):
+    requester = requester_factory(stream=False)
+
+    result = asyncio.run(requester.asend_request(None, None, {"prompt": "Say hello"}))
+
+    assert result.status_code == 200
+    assert result.token_num == 3
+    assert result.ttft is None
+    assert requester.aclient.completions.calls[0]["stream"] is False
+
+
+def test_missing_usage_is_reported_as_runtime_error(requester_factory):
+    requester = requester_factory(stream=True)
+
+    async def stream_without_usage():
+        yield _chunk("Hi")
+
+    async def create(**kwargs):
+        return stream_without_usage()
+
+    requester.aclient.completions.create = create
+
+    result = asyncio.run(requester.asend_request(None, None, {"prompt": "Say hello"}))
+
+    assert result.status_code == 600
+    assert result.token_num is None
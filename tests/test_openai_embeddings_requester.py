@@ -0,0 +1,73 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from zorobench.cli import root
+from zorobench.requester.openai_embeddings_requester import OpenAIEmbeddingsRequester
+
+
+class StubEmbeddings:
+    def __init__(self, tokens_per_input=5):
+        self.tokens_per_input = tokens_per_input
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        inputs = kwargs["input"] if isinstance(kwargs["input"], list) else [kwargs["input"]]
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=[0.0, 1.0]) for _ in inputs],
+            usage=SimpleNamespace(prompt_tokens=self.tokens_per_input * len(inputs)),
+        )
+
+
+@pytest.fixture()
+def requester():
+    requester = OpenAIEmbeddingsRequester(model="test-model", api_key="test")
+    requester.aclient = SimpleNamespace(embeddings=StubEmbeddings())
+    return requester
+
+
+def test_request_counts_items_and_prompt_tokens(requester):
+    result = asyncio.run(requester.asend_request(params={"input": ["a", "b", "c"]}))
+
+    assert result.status_code == 200
+    assert result.num_items == 3
+    assert result.token_num == 15
+    assert result.ttft is None
+    assert requester.aclient.embeddings.calls == [{"input": ["a", "b", "c"], "model": "test-model"}]
+
+
+def test_missing_usage_is_reported_as_runtime_error(requester):
+    async def create(**kwargs):
+        return SimpleNamespace(data=[], usage=None)
+
+    requester.aclient.embeddings.create = create
+
+    result = asyncio.run(requester.asend_request(params={"input": "a"}))
+
+    assert result.status_code == 600
+    assert result.num_items is None
+
+
+def test_embed_reports_each_batch_size(tmp_path, monkeypatch, requester):
+    data_file = tmp_path / "inputs.jsonl"
+    data_file.write_text("\n".join(json.dumps({"input": f"text {i}"}) for i in range(10)) + "\n", encoding="utf-8")
+    output_file = tmp_path / "embeddings_output.json"
+    monkeypatch.setattr(root, "OpenAIEmbeddingsRequester", lambda model: requester)
+
+    root.Root().embed(
+        "test-model", str(data_file), batch_sizes=(1, 4), concurrency=2, output_file=str(output_file), cache_dir=None
+    )
+
+    batch_lengths = sorted(len(call["input"]) for call in requester.aclient.embeddings.calls)
+    assert batch_lengths == sorted([1] * 10 + [4, 4, 2])
+
+    report = json.loads(output_file.read_text())
+    assert list(report) == ["1", "4"]
+    assert report["1"]["Status codes"] == {"200": 10}
+    assert report["4"]["Status codes"] == {"200": 3}
+    for summary in report.values():
+        assert summary["Items/s"] > 0
+        assert summary["Tokens/s"] == pytest.approx(5 * summary["Items/s"])
@@ -95,3 +95,19 @@ def test_itl_derived_from_successful_requests_only(tmp_path, sample_statistics):
 
     assert data["ITL"]["mean"] == pytest.approx(expected_itl_mean)
     assert data["ITL"]["p50"] == pytest.approx(expected_itl_p50)
+
+
+def test_throughput_summary_counts_successful_items_and_tokens():
+    statistics = [
+        RequestStatistics(e2e=0.5, ttft=None, itl=(), token_num=40, status_code=200, num_items=8),
+        RequestStatistics(e2e=1.5, ttft=None, itl=(), token_num=60, status_code=200, num_items=8),
+        RequestStatistics(e2e=3.0, ttft=None, itl=None, token_num=None, status_code=500),
+    ]
+
+    summary = RequestStatistics.throughput_summary(statistics, total_time=2.0)
+
+    assert summary["Requests/s"] == pytest.approx(1.0)
+    assert summary["Items/s"] == pytest.approx(8.0)
+    assert summary["Tokens/s"] == pytest.approx(50.0)
+    assert summary["E2E"]["mean"] == pytest.approx(1.0)
+    assert summary["Status codes"] == {"200": 2, "500": 1}